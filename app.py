@@ -24,15 +24,21 @@ REQUIREMENTS:
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
+import openpyxl
 from pyzbar import pyzbar
 import base64
+import csv
 import io
 from datetime import datetime
 import time
+import queue
+import threading
+import logging
 from streamlit_webrtc import webrtc_streamer, WebRtcMode, RTCConfiguration
-from typing import Set, List, Dict, Optional
+from typing import Set, FrozenSet, List, Dict, Optional
 
 # Import cv2 and av with error handling
 try:
@@ -48,6 +54,16 @@ except ImportError as e:
     st.error(f"PyAV import failed: {e}")
     st.info("Please install PyAV or ensure all system dependencies are installed.")
     st.stop()
+
+# PyArrow is optional; CSV loading falls back to pandas without it
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+logger = logging.getLogger(__name__)
+
 # Page configuration
 st.set_page_config(
     page_title="Barcode Scanner App",
@@ -60,44 +76,112 @@ st.set_page_config(
 def initialize_session_state():
     """Initialize all session state variables"""
     if 'valid_barcodes' not in st.session_state:
-        st.session_state.valid_barcodes = set()
-    if 'scanned_barcodes' not in st.session_state:
-        st.session_state.scanned_barcodes = []
+        st.session_state.valid_barcodes = frozenset()
+    if 'scan_codes' not in st.session_state:
+        # Scan history kept as parallel column lists
+        st.session_state.scan_codes = []
+        st.session_state.scan_times = []
+        st.session_state.scan_statuses = []
+    if 'scanned_set' not in st.session_state:
+        st.session_state.scanned_set = set()
     if 'last_scanned' not in st.session_state:
         st.session_state.last_scanned = None
     if 'scan_status' not in st.session_state:
         st.session_state.scan_status = None
     if 'file_uploaded' not in st.session_state:
         st.session_state.file_uploaded = False
+    if '_history_df' not in st.session_state:
+        # Formatted scan history table, rebuilt only when the history length changes
+        st.session_state._history_df = None
+        st.session_state._history_df_len = -1
+
+# Audio feedback (simple beeps as base64 encoded WAV)
+_SUCCESS_B64 = "data:audio/wav;base64,UklGRnoGAABXQVZFZm10IBAAAAABAAEAQB8AAEAfAAABAAgAZGF0YQoGAACBhYqFbF1fdJivrJBhNjVgodDbq2EcBj+a2/LDciUFLIHO8tiJNwgZaLvt559NEAxQp+PwtmMcBjiR1/LMeSwFJHfH8N2QQAoUXrTp66hVFApGn+DyvmsdCTGH0fPTgjMGHm7A7+OZSA0PVqzn77BdGAg+ltryxnkpBSl+zPLaizsIGGS57OihUgwLTKXh8bllHgg2jdXzzn0vBSF1xe/glEILElyx5+2qWBUIQ5zd8sFuIAUuhM/z2YU2Bhxqvu7mnEoODlOq5O+zYBoGPJPY88p9KwUme8rx3I4+CRZiturqpVITC0ml4PK8aB4GM4nU8tGAMQYfcsLu45ZFDBFYr+ftrVoXCECY3PLEcSEELIHO8tiJOQcZZ7zs4Z9NEAxPqOPwtmQcBjiS2fHNeSsFJHfH8N2QQAoUXrTp66hVFApGnt/yvmwdCTCG0fPTgzQGHW/A7eSaRw0PVqzl8LJeGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdT0z3wvBSJ0xe/glEILElyx5+2qWRUIQ5zd8sFuIAUug8/y2oU2Bhxqvu3mnEoPDlOq5O+zYRsGPJLZ8sp9KgUme8rx3I4+CRVht+vtpVMSC0mk4PK8aB4GMojU8tGAMQYfccPu45ZFDBFYruftrVwWCECY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHG/A7eSaSQ0PVqrl8LJfGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4SC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHG/A7eSaSQ0PVqrl8LJfGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4SC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHW/A7eSaSQ0PVqrl8LJfGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4TC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHW/A7eSaSQ0PVqnl8LJfGQc6lPvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4TC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHW/A7eSaSQ0PVqrl8LJfGQc6ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4TC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0X"
 
-# Audio functions
-def get_success_sound():
-    """Generate base64 encoded success sound (simple beep)"""
-    # Simple success sound as base64
-    return "data:audio/wav;base64,UklGRnoGAABXQVZFZm10IBAAAAABAAEAQB8AAEAfAAABAAgAZGF0YQoGAACBhYqFbF1fdJivrJBhNjVgodDbq2EcBj+a2/LDciUFLIHO8tiJNwgZaLvt559NEAxQp+PwtmMcBjiR1/LMeSwFJHfH8N2QQAoUXrTp66hVFApGn+DyvmsdCTGH0fPTgjMGHm7A7+OZSA0PVqzn77BdGAg+ltryxnkpBSl+zPLaizsIGGS57OihUgwLTKXh8bllHgg2jdXzzn0vBSF1xe/glEILElyx5+2qWBUIQ5zd8sFuIAUuhM/z2YU2Bhxqvu7mnEoODlOq5O+zYBoGPJPY88p9KwUme8rx3I4+CRZiturqpVITC0ml4PK8aB4GM4nU8tGAMQYfcsLu45ZFDBFYr+ftrVoXCECY3PLEcSEELIHO8tiJOQcZZ7zs4Z9NEAxPqOPwtmQcBjiS2fHNeSsFJHfH8N2QQAoUXrTp66hVFApGnt/yvmwdCTCG0fPTgzQGHW/A7eSaRw0PVqzl8LJeGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdT0z3wvBSJ0xe/glEILElyx5+2qWRUIQ5zd8sFuIAUug8/y2oU2Bhxqvu3mnEoPDlOq5O+zYRsGPJLZ8sp9KgUme8rx3I4+CRVht+vtpVMSC0mk4PK8aB4GMojU8tGAMQYfccPu45ZFDBFYruftrVwWCECY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHG/A7eSaSQ0PVqrl8LJfGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4SC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHG/A7eSaSQ0PVqrl8LJfGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4SC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHW/A7eSaSQ0PVqrl8LJfGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4TC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHW/A7eSaSQ0PVqnl8LJfGQc6lPvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4TC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHW/A7eSaSQ0PVqrl8LJfGQc6ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4TC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0X"
+_FAILURE_B64 = "data:audio/wav;base64,UklGRnoGAABXQVZFZm10IBAAAAABAAEAQB8AAEAfAAABAAgAZGF0YSoGAACFhYqFbF1fdJivrJBhNjVgodDbq2EcBj+a2/LDciUFLIHO8tiJNwgZaLvt559NEAxQp+PwtmMcBjiR1/LMeSwFJHfH8N2QQAoUXrTp66hVFApGn+DyvmsdCTGH0fPTgjMGHm7A7+OZSA0PVqzn77BdGAg+ltryxnkpBSl+zPLaizsIGGS57OihUgwLTKXh8bllHgg2jdXzzn0vBSF1xe/glEILElyx5+2qWBUIQ5zd8sFuIAUuhM/z2YU2Bhxqvu7mnEoODlOq5O+zYBoGPJPY88p9KwUme8rx3I4+CRZiturqpVITC0ml4PK8aB4GM4nU8tGAMQYfcsLu45ZFDBFYr+ftrVoXCECY3PLEcSEELIHO8tiJOQcZZ7zs4Z9NEAxPqOPwtmQcBjiS2fHNeSsFJHfH8N2QQAoUXrTp66hVFApGnt/yvmwdCTCG0fPTgzQGHW/A7eSaRw0PVqzl8LJeGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdT0z3wvBSJ0xe/glEILElyx5+2qWRUIQ5zd8sFuIAUug8/y2oU2Bhxqvu3mnEoPDlOq5O+zYRsGPJLZ8sp9KgUme8rx3I4+CRVht+vtpVMSC0mk4PK8aB4GMojU8tGAMQYfccPu45ZFDBFYruftrVwWCECY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHG/A7eSaSQ0PVqrl8LJfGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4SC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHG/A7eSaSQ0PVqrl8LJfGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4SC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHW/A7eSaSQ0PVqrl8LJfGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4TC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHW/A7eSaSQ0PVqnl8LJfGQc6lPvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4TC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHW/A7eSaSQ0PVqrl8LJfGQc6ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4TC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0X"
 
-def get_failure_sound():
-    """Generate base64 encoded failure sound"""
-    return "data:audio/wav;base64,UklGRnoGAABXQVZFZm10IBAAAAABAAEAQB8AAEAfAAABAAgAZGF0YSoGAACFhYqFbF1fdJivrJBhNjVgodDbq2EcBj+a2/LDciUFLIHO8tiJNwgZaLvt559NEAxQp+PwtmMcBjiR1/LMeSwFJHfH8N2QQAoUXrTp66hVFApGn+DyvmsdCTGH0fPTgjMGHm7A7+OZSA0PVqzn77BdGAg+ltryxnkpBSl+zPLaizsIGGS57OihUgwLTKXh8bllHgg2jdXzzn0vBSF1xe/glEILElyx5+2qWBUIQ5zd8sFuIAUuhM/z2YU2Bhxqvu7mnEoODlOq5O+zYBoGPJPY88p9KwUme8rx3I4+CRZiturqpVITC0ml4PK8aB4GM4nU8tGAMQYfcsLu45ZFDBFYr+ftrVoXCECY3PLEcSEELIHO8tiJOQcZZ7zs4Z9NEAxPqOPwtmQcBjiS2fHNeSsFJHfH8N2QQAoUXrTp66hVFApGnt/yvmwdCTCG0fPTgzQGHW/A7eSaRw0PVqzl8LJeGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdT0z3wvBSJ0xe/glEILElyx5+2qWRUIQ5zd8sFuIAUug8/y2oU2Bhxqvu3mnEoPDlOq5O+zYRsGPJLZ8sp9KgUme8rx3I4+CRVht+vtpVMSC0mk4PK8aB4GMojU8tGAMQYfccPu45ZFDBFYruftrVwWCECY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHG/A7eSaSQ0PVqrl8LJfGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4SC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHG/A7eSaSQ0PVqrl8LJfGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4SC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHW/A7eSaSQ0PVqrl8LJfGQc9ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4TC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHW/A7eSaSQ0PVqnl8LJfGQc6lPvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4TC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0XB0CY3PLEcSEGK4DN8tiIOQcZZ7vs4Z9OEAxOpePxtmQdBTiS2fHNeSsFJHbH8N2QQAoUXrPq66hWFAlFnt/yv2wdCTCG0fPTgzQHHW/A7eSaSQ0PVqrl8LJfGQc6ltvyxnkpBSh+zPDaizsIGGS56+mjUgwLTKXh8bllHgg2jdTy0H4wBiFzxu7glEQKElux5+2qWRUJQprd8sFuIAUug8/y2oU2Bhxqvu3mnEwODVKp5e+zYRsGOpPX8sp9KgUmecnw3Y9ACRVdt+vupl4TC0mk4PK8aB4GMojS89GAMgUfccLt45dGCxFYruftrV0X"
+# Audio elements rendered once per page; scan feedback only triggers playback
+AUDIO_PRELOAD_HTML = f"""
+<audio id="success-sound" src="{_SUCCESS_B64}" preload="auto"></audio>
+<audio id="failure-sound" src="{_FAILURE_B64}" preload="auto"></audio>
+<script>
+window.parent.playScanSound = (id) => {{
+    const audio = document.getElementById(id);
+    audio.currentTime = 0;
+    audio.play();
+}};
+</script>
+"""
 
-def play_sound(sound_data: str):
-    """Play sound using HTML audio element"""
-    audio_html = f"""
-    <audio autoplay>
-        <source src="{sound_data}" type="audio/wav">
-    </audio>
-    """
-    st.markdown(audio_html, unsafe_allow_html=True)
+def play_scan_sound(sound_id: str):
+    """Play one of the preloaded feedback sounds"""
+    # The timestamp keeps consecutive triggers distinct so the browser re-runs the script
+    components.html(
+        f"<script>window.parent.playScanSound && window.parent.playScanSound('{sound_id}'); // {time.time()}</script>",
+        height=0
+    )
 
 # File handling functions
-def load_barcodes_from_file(uploaded_file) -> Set[str]:
-    """Load barcodes from uploaded Excel or CSV file"""
+def read_csv_first_column(uploaded_file) -> pd.DataFrame:
+    """Read only the first column of a CSV file, using PyArrow when available"""
+    if pacsv is None:
+        return pd.read_csv(uploaded_file, usecols=[0], dtype=str, keep_default_na=False, na_filter=False)
+    
+    # PyArrow needs the column name up front to skip parsing the others
+    header = next(csv.reader([uploaded_file.readline().decode('utf-8-sig')]), None)
+    if not header:
+        raise ValueError("The uploaded file is empty.")
+    uploaded_file.seek(0)
+    
+    table = pacsv.read_csv(
+        uploaded_file,
+        read_options=pacsv.ReadOptions(use_threads=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=[header[0]],
+            column_types={header[0]: pa.string()}
+        )
+    )
+    return table.to_pandas()
+
+def read_excel_fast(uploaded_file) -> pd.DataFrame:
+    """Read the first column of an Excel file with the calamine engine, falling back to the default engine"""
+    try:
+        return pd.read_excel(uploaded_file, engine='calamine', usecols=[0], dtype=str, na_filter=False)
+    except ImportError:
+        uploaded_file.seek(0)
+        return pd.read_excel(uploaded_file, usecols=[0], dtype=str, na_filter=False)
+
+def read_xlsx_barcodes(uploaded_file) -> Set[str]:
+    """Stream the first column of an .xlsx workbook into a set without building a DataFrame"""
+    workbook = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
     try:
-        # Determine file type and read accordingly
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
-        elif uploaded_file.name.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(uploaded_file)
+        # Row 1 is the header, matching how pandas reads the other formats
+        rows = workbook.active.iter_rows(min_row=2, min_col=1, max_col=1, values_only=True)
+        barcode_set = {str(row[0]).strip() for row in rows if row[0] is not None}
+    finally:
+        workbook.close()
+    
+    # Remove empty strings
+    barcode_set.discard('')
+    
+    if not barcode_set:
+        raise ValueError("The uploaded file is empty.")
+    
+    return barcode_set
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_barcodes_cached(file_bytes: bytes, name: str) -> FrozenSet[str]:
+    """Parse barcode file contents; cached on the file bytes so reruns skip re-parsing"""
+    file_buffer = io.BytesIO(file_bytes)
+    
+    # Determine file type and read accordingly
+    if name.endswith('.xlsx'):
+        barcode_set = read_xlsx_barcodes(file_buffer)
+    else:
+        if name.endswith('.csv'):
+            df = read_csv_first_column(file_buffer)
+        elif name.endswith('.xls'):
+            df = read_excel_fast(file_buffer)
         else:
             raise ValueError("Unsupported file format. Please upload CSV or Excel file.")
         
@@ -105,25 +189,59 @@ def load_barcodes_from_file(uploaded_file) -> Set[str]:
         if df.empty:
             raise ValueError("The uploaded file is empty.")
         
-        # Get first column values, remove NaN, and convert to strings
-        first_column = df.iloc[:, 0].dropna().astype(str).str.strip()
-        barcode_set = set(first_column.tolist())
-        
-        # Remove empty strings
-        barcode_set.discard('')
-        
-        return barcode_set
-        
+        # Columns are read as strings with empty cells kept as '', so only stripping is needed;
+        # unique() deduplicates in pandas' hashtable before any Python set is built
+        first_column = df.iloc[:, 0].str.strip()
+        barcode_set = set(first_column[first_column != ''].unique().tolist())
+    
+    return frozenset(barcode_set)
+
+def load_barcodes_from_file(uploaded_file) -> FrozenSet[str]:
+    """Load barcodes from uploaded Excel or CSV file"""
+    try:
+        return _load_barcodes_cached(uploaded_file.getvalue(), uploaded_file.name)
     except Exception as e:
         st.error(f"Error reading file: {str(e)}")
-        return set()
+        return frozenset()
 
 # Barcode scanning functions
+# Barcode formats the scanner accepts, applied to both decoders (each extra one is another scan pass in ZBar)
+SCAN_SYMBOLS = [pyzbar.ZBarSymbol.EAN13, pyzbar.ZBarSymbol.EAN8, pyzbar.ZBarSymbol.CODE128, pyzbar.ZBarSymbol.QRCODE]
+
+# OpenCV's names for the accepted formats it can decode, mapped to pyzbar's names
+CV_SCAN_TYPES = {'EAN_13': 'EAN13', 'EAN_8': 'EAN8'}
+
+# OpenCV's native 1D barcode detector; pyzbar is only used when it finds nothing
+_cv_detector = cv2.barcode.BarcodeDetector()
+
 def detect_barcodes(frame):
     """Detect and decode barcodes in the given frame"""
-    barcodes = pyzbar.decode(frame)
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
     detected_codes = []
     
+    # Try OpenCV's detector first
+    ok, decoded_info, decoded_types, points = _cv_detector.detectAndDecodeWithType(gray)
+    if ok:
+        for barcode_data, barcode_type, corners in zip(decoded_info, decoded_types, points):
+            # Skip barcodes that were located but could not be decoded, or aren't accepted formats
+            if not barcode_data or barcode_type not in CV_SCAN_TYPES:
+                continue
+            
+            # Convert the corner quad to an axis-aligned box
+            (x, y, w, h) = cv2.boundingRect(corners.astype(np.int32))
+            
+            detected_codes.append({
+                'data': barcode_data,
+                'type': CV_SCAN_TYPES[barcode_type],
+                'location': (x, y, w, h)
+            })
+    
+    if detected_codes:
+        return detected_codes
+    
+    # Fall back to pyzbar (also covers QR codes, which OpenCV's detector doesn't handle)
+    barcodes = pyzbar.decode(gray, symbols=SCAN_SYMBOLS)
+    
     for barcode in barcodes:
         # Extract barcode data and type
         barcode_data = barcode.data.decode('utf-8')
@@ -140,77 +258,184 @@ def detect_barcodes(frame):
     
     return detected_codes
 
-def draw_barcode_box(frame, barcode_info, is_valid=False):
-    """Draw bounding box around detected barcode"""
-    x, y, w, h = barcode_info['location']
-    
-    # Choose color based on validity
-    color = (0, 255, 0) if is_valid else (0, 0, 255)  # Green if valid, Red if invalid
+VALID_COLOR = (0, 255, 0)  # Green
+INVALID_COLOR = (0, 0, 255)  # Red
+
+def draw_barcode_boxes(frame, boxes):
+    """Draw bounding boxes around detected barcodes, batching rectangles by color"""
+    valid_pts = []
+    invalid_pts = []
     
-    # Draw rectangle
-    cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+    for barcode_info, is_valid in boxes:
+        x, y, w, h = barcode_info['location']
+        corners = [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+        (valid_pts if is_valid else invalid_pts).append(corners)
+        
+        # Add text
+        color = VALID_COLOR if is_valid else INVALID_COLOR
+        text = f"{barcode_info['data']} ({'✓' if is_valid else '✗'})"
+        cv2.putText(frame, text, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
     
-    # Add text
-    text = f"{barcode_info['data']} ({'✓' if is_valid else '✗'})"
-    cv2.putText(frame, text, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+    # Draw all rectangles of each color in a single call
+    if valid_pts:
+        cv2.polylines(frame, np.array(valid_pts, np.int32), True, VALID_COLOR, 2)
+    if invalid_pts:
+        cv2.polylines(frame, np.array(invalid_pts, np.int32), True, INVALID_COLOR, 2)
     
     return frame
 
+# Scan history functions
+def build_scan_history_df() -> pd.DataFrame:
+    """Build the scan history DataFrame directly from the session's column lists"""
+    return pd.DataFrame({
+        'barcode': st.session_state.scan_codes,
+        'timestamp': st.session_state.scan_times,
+        'status': st.session_state.scan_statuses
+    })
+
+def record_scan_results(scan_results):
+    """Record (barcode, is_valid, timestamp) results reported by the video processor"""
+    added_now = set()
+    for barcode_data, is_valid, scanned_at in scan_results:
+        # A repeat of a code recorded in this batch must not turn 'success' into 'duplicate'
+        if barcode_data in added_now:
+            continue
+        
+        if is_valid and barcode_data not in st.session_state.scanned_set:
+            # Valid and new barcode
+            st.session_state.scan_codes.append(barcode_data)
+            st.session_state.scan_times.append(scanned_at)
+            st.session_state.scan_statuses.append('Valid')
+            st.session_state.scanned_set.add(barcode_data)
+            st.session_state.scan_status = 'success'
+            added_now.add(barcode_data)
+        elif is_valid:
+            # Already scanned
+            st.session_state.scan_status = 'duplicate'
+        else:
+            # Invalid barcode
+            st.session_state.scan_status = 'invalid'
+        st.session_state.last_scanned = barcode_data
+
 # WebRTC callback class
 class BarcodeProcessor:
     def __init__(self):
         self.last_scan_time = 0
         self.scan_cooldown = 2.0  # 2 seconds between scans
+        self.scan_width = 480  # Max frame width fed to the decoder
+        self.frame_counter = 0
+        self.decode_every = 3  # Only decode every Nth frame
+        self.min_brightness = 40  # Mean luma below which frames are too dark to decode
+        self.valid_barcodes = frozenset()  # Set by the script; the worker can't read session state
+        
+        # Decoding runs on a background thread so recv never blocks the video stream
+        self.frame_q = queue.Queue(maxsize=1)
+        self.result_lock = threading.Lock()
+        self.latest_boxes = []  # (barcode_info, is_valid) pairs from the last decoded frame
+        self.latest_boxes_time = 0
+        self.box_ttl = 0.5  # Seconds a decoded box stays on screen
+        self.scan_results = []  # (barcode, is_valid, timestamp) not yet picked up by the script
+        self.stop_event = threading.Event()
+        threading.Thread(target=self._decode_worker, daemon=True).start()
     
     def recv(self, frame):
         img = frame.to_ndarray(format="bgr24")
         
         # Only process every few frames to improve performance
+        self.frame_counter += 1
         current_time = time.time()
-        if current_time - self.last_scan_time > self.scan_cooldown:
-            # Detect barcodes
-            detected_barcodes = detect_barcodes(img)
-            
-            for barcode_info in detected_barcodes:
-                barcode_data = barcode_info['data']
-                
-                # Check if barcode is valid
-                if (barcode_data in st.session_state.valid_barcodes and 
-                    barcode_data not in [scan['barcode'] for scan in st.session_state.scanned_barcodes]):
-                    
-                    # Valid and new barcode
-                    st.session_state.scanned_barcodes.append({
-                        'barcode': barcode_data,
-                        'timestamp': datetime.now(),
-                        'status': 'Valid'
-                    })
-                    st.session_state.scan_status = 'success'
-                    st.session_state.last_scanned = barcode_data
-                    self.last_scan_time = current_time
-                    
-                elif barcode_data in st.session_state.valid_barcodes:
-                    # Already scanned
-                    st.session_state.scan_status = 'duplicate'
-                    st.session_state.last_scanned = barcode_data
-                    self.last_scan_time = current_time
-                    
-                else:
-                    # Invalid barcode
-                    st.session_state.scan_status = 'invalid'
-                    st.session_state.last_scanned = barcode_data
-                    self.last_scan_time = current_time
-                
-                # Draw bounding box
-                is_valid = barcode_data in st.session_state.valid_barcodes
-                img = draw_barcode_box(img, barcode_info, is_valid)
+        if (self.frame_counter % self.decode_every == 0 and
+            current_time - self.last_scan_time > self.scan_cooldown):
+            # Hand the frame and its capture time to the worker, dropping it if the worker is backed up
+            try:
+                self.frame_q.put_nowait((current_time, img.copy()))
+            except queue.Full:
+                pass
+        
+        # Draw the most recent detections until they go stale (no frames are decoded during cooldown)
+        with self.result_lock:
+            boxes = self.latest_boxes
+            boxes_time = self.latest_boxes_time
+        if boxes and current_time - boxes_time < self.box_ttl:
+            img = draw_barcode_boxes(img, boxes)
         
         return av.VideoFrame.from_ndarray(img, format="bgr24")
+    
+    def pop_scan_results(self):
+        """Return and clear the scan results collected since the last call"""
+        with self.result_lock:
+            scan_results = self.scan_results
+            self.scan_results = []
+        return scan_results
+    
+    def on_ended(self):
+        """Stop the decode worker when the stream ends"""
+        self.stop_event.set()
+    
+    def _decode_worker(self):
+        """Decode queued frames and publish the resulting boxes"""
+        while not self.stop_event.is_set():
+            try:
+                captured_at, img = self.frame_q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            # Frames queued while an earlier frame was still decoding may fall inside its cooldown
+            if captured_at - self.last_scan_time <= self.scan_cooldown:
+                continue
+            
+            # Keep the worker alive on errors so scanning doesn't silently stop
+            try:
+                self._decode_frame(img, captured_at)
+            except Exception:
+                logger.exception("Barcode decoding failed")
+    
+    def _decode_frame(self, img, captured_at):
+        """Detect barcodes in a frame and publish boxes to draw and scan results"""
+        # Downscale wide frames before decoding; barcodes stay readable at this size
+        scale = 1.0
+        small = img
+        if img.shape[1] > self.scan_width:
+            scale = self.scan_width / img.shape[1]
+            small = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        
+        # Skip decoding on frames too dark for pyzbar to read anything
+        if small.mean() < self.min_brightness:
+            detected_barcodes = []
+        else:
+            detected_barcodes = detect_barcodes(small)
+        
+        boxes = []
+        scan_results = []
+        
+        for barcode_info in detected_barcodes:
+            barcode_data = barcode_info['data']
+            is_valid = barcode_data in self.valid_barcodes
+            
+            # Map the box back to full-resolution coordinates
+            if scale != 1.0:
+                barcode_info['location'] = tuple(int(v / scale) for v in barcode_info['location'])
+            
+            boxes.append((barcode_info, is_valid))
+            scan_results.append((barcode_data, is_valid, datetime.now()))
+        
+        with self.result_lock:
+            self.latest_boxes = boxes
+            self.latest_boxes_time = time.time()
+            self.scan_results.extend(scan_results)
+        
+        # Start the cooldown from the capture time of the frame that produced a detection
+        if scan_results:
+            self.last_scan_time = captured_at
 
 # Main application
 def main():
     # Initialize session state
     initialize_session_state()
     
+    # Load feedback sounds into the page
+    components.html(AUDIO_PRELOAD_HTML, height=0)
+    
     # Header
     st.title("📱 Barcode Scanner App")
     st.markdown("---")
@@ -248,19 +473,25 @@ def main():
         st.header("🎛️ Controls")
         
         if st.button("🗑️ Clear Scan History", type="secondary"):
-            st.session_state.scanned_barcodes = []
+            st.session_state.scan_codes = []
+            st.session_state.scan_times = []
+            st.session_state.scan_statuses = []
+            st.session_state.scanned_set = set()
+            st.session_state._history_df = None
+            st.session_state._history_df_len = -1
             st.session_state.scan_status = None
             st.session_state.last_scanned = None
             st.success("History cleared!")
         
         # Export functionality
-        if st.session_state.scanned_barcodes:
+        if st.session_state.scan_codes:
             if st.button("📥 Export Scanned Barcodes", type="secondary"):
-                df_export = pd.DataFrame(st.session_state.scanned_barcodes)
-                csv = df_export.to_csv(index=False)
+                # Encode straight to bytes, only when an export is requested
+                csv_buffer = io.BytesIO()
+                build_scan_history_df().to_csv(csv_buffer, index=False, encoding='utf-8')
                 st.download_button(
                     label="Download CSV",
-                    data=csv,
+                    data=csv_buffer,
                     file_name=f"scanned_barcodes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv"
                 )
@@ -287,6 +518,11 @@ def main():
                 async_processing=True,
             )
             
+            # Share the barcode list with the processor and collect its scan results
+            if webrtc_ctx.video_processor:
+                webrtc_ctx.video_processor.valid_barcodes = st.session_state.valid_barcodes
+                record_scan_results(webrtc_ctx.video_processor.pop_scan_results())
+            
             st.info("💡 **Tips:**")
             st.markdown("""
             - Hold barcode steady in camera view
@@ -306,9 +542,8 @@ def main():
             with status_placeholder.container():
                 st.success(f"✅ Valid Barcode Scanned!")
                 st.code(st.session_state.last_scanned)
-                st.balloons()
                 # Play success sound
-                play_sound(get_success_sound())
+                play_scan_sound('success-sound')
             # Reset status after showing
             st.session_state.scan_status = None
             
@@ -317,7 +552,7 @@ def main():
                 st.error(f"❌ Invalid Barcode!")
                 st.code(st.session_state.last_scanned)
                 # Play failure sound
-                play_sound(get_failure_sound())
+                play_scan_sound('failure-sound')
             # Reset status after showing
             st.session_state.scan_status = None
             
@@ -332,7 +567,7 @@ def main():
         if st.session_state.file_uploaded:
             st.markdown("### 📈 Statistics")
             total_valid = len(st.session_state.valid_barcodes)
-            total_scanned = len(st.session_state.scanned_barcodes)
+            total_scanned = len(st.session_state.scan_codes)
             progress = (total_scanned / total_valid) * 100 if total_valid > 0 else 0
             
             st.metric("Total Valid Barcodes", total_valid)
@@ -346,10 +581,14 @@ def main():
     st.markdown("---")
     st.header("📋 Scan History")
     
-    if st.session_state.scanned_barcodes:
-        # Create DataFrame for display
-        df_history = pd.DataFrame(st.session_state.scanned_barcodes)
-        df_history['timestamp'] = df_history['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
+    if st.session_state.scan_codes:
+        # Create DataFrame for display, reusing the cached one if nothing new was scanned
+        if len(st.session_state.scan_codes) != st.session_state._history_df_len:
+            df_history = build_scan_history_df()
+            df_history['timestamp'] = pd.to_datetime(df_history['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
+            st.session_state._history_df = df_history
+            st.session_state._history_df_len = len(st.session_state.scan_codes)
+        df_history = st.session_state._history_df
         
         # Display as table
         st.dataframe(
@@ -366,17 +605,17 @@ def main():
         # Summary by status
         col1, col2, col3 = st.columns(3)
         with col1:
-            valid_count = len([s for s in st.session_state.scanned_barcodes if s['status'] == 'Valid'])
+            valid_count = st.session_state.scan_statuses.count('Valid')
             st.metric("✅ Valid Scans", valid_count)
         
         with col2:
             # Show remaining barcodes
-            remaining = len(st.session_state.valid_barcodes) - len(st.session_state.scanned_barcodes)
+            remaining = len(st.session_state.valid_barcodes) - len(st.session_state.scan_codes)
             st.metric("📋 Remaining", remaining)
         
         with col3:
             # Show completion percentage
-            completion = (len(st.session_state.scanned_barcodes) / len(st.session_state.valid_barcodes)) * 100 if st.session_state.valid_barcodes else 0
+            completion = (len(st.session_state.scan_codes) / len(st.session_state.valid_barcodes)) * 100 if st.session_state.valid_barcodes else 0
             st.metric("📊 Completion", f"{completion:.1f}%")
     
     else: